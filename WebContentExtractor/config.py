@@ -26,6 +26,7 @@ class ExtractionConfig:
     download_images: bool = True  # 是否下载图片
     image_skip_keywords: List[str] = field(default_factory=lambda: ['icon', 'avatar', 'logo'])
     images_folder_name: str = "imgs"  # 图片文件夹名称（默认使用imgs）
+    image_workers: int = 8  # 单篇文章图片下载线程数
     
     # 格式配置
     preserve_bold: bool = True  # 保留粗体
@@ -33,9 +34,15 @@ class ExtractionConfig:
     preserve_code: bool = True  # 保留代码格式
     preserve_links: bool = True  # 保留链接
     
+    # 解析配置
+    html_parser: str = 'selectolax'  # HTML解析器：selectolax（最快）/ lxml / html.parser，未安装时自动逐级回退
+
     # 请求配置
     timeout: int = 30  # 请求超时时间（秒）
-    delay: float = 1.0  # 请求间隔（秒）
+    delay: float = 1.0  # 同一域名两次请求的最小间隔（秒，0表示不限速）
+    max_retries: int = 3  # 429/5xx或网络错误时的最大重试次数
+    concurrency: int = 8  # 并发请求数（需安装aiohttp，设为1则串行）
+    parse_workers: int = 0  # 解析/生成Markdown的进程数（0=不启用进程池，解析成为瓶颈时可设为CPU核数）
     headers: Dict[str, str] = field(default_factory=lambda: {
         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
     })
@@ -5,22 +5,139 @@
 """
 
 import os
+import re
 import time
 import json
+import random
+import shutil
+import traceback
+import asyncio
+import threading
 import requests
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup, NavigableString
 from urllib.parse import urljoin, urlparse
 from typing import List, Dict, Optional, Tuple
 from .config import ExtractionConfig
 
+# selectolax（Lexbor引擎）解析+遍历比BeautifulSoup快10倍以上，未安装时回退BeautifulSoup
+try:
+    from selectolax.lexbor import LexborHTMLParser, LexborNode
+except ImportError:
+    LexborHTMLParser = None
+    LexborNode = None
+
+# aiohttp用于并发抓取文章，未安装时回退串行requests
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+# 容器类块级元素：整体输出，不再下探其子元素
+_CONTAINER_TAGS = {'blockquote', 'ul', 'ol', 'pre', 'table'}
+
+# Windows不允许的文件名字符（预编译，_sanitize_filename每篇文章多次调用）
+_FILENAME_RE = re.compile(r'[<>:"/\\|?*]')
+
+
+# ---- 节点操作辅助函数：统一selectolax与BeautifulSoup的节点API ----
+
+def _is_lexbor(node) -> bool:
+    """是否为selectolax节点"""
+    return LexborNode is not None and isinstance(node, LexborNode)
+
+
+def _node_tag(node) -> Optional[str]:
+    """节点标签名，文本/注释节点返回None"""
+    if _is_lexbor(node):
+        tag = node.tag
+        return None if tag.startswith('-') else tag
+    return getattr(node, 'name', None)
+
+
+def _node_text(node) -> str:
+    """节点的完整文本（含所有后代）"""
+    if _is_lexbor(node):
+        return node.text(deep=True)
+    return node.get_text()
+
+
+def _text_node_value(node) -> str:
+    """文本节点自身的文本内容"""
+    if _is_lexbor(node):
+        return node.text(deep=False) if node.tag == '-text' else ''
+    return str(node)
+
+
+def _node_attr(node, name: str, default: str = '') -> str:
+    """获取节点属性，统一返回字符串"""
+    if _is_lexbor(node):
+        value = node.attributes.get(name)
+        return default if value is None else value
+    value = node.get(name, default)
+    if isinstance(value, list):
+        value = ' '.join(value)
+    return value
+
+
+def _node_children(node):
+    """直接子节点迭代（含文本节点）"""
+    if _is_lexbor(node):
+        return node.iter(include_text=True)
+    return node.children
+
+
+def _css(node, selector: str) -> list:
+    """CSS选择器查询所有后代"""
+    if _is_lexbor(node):
+        return node.css(selector)
+    return node.select(selector)
+
+
+def _css_first(node, selector: str):
+    """CSS选择器查询第一个后代"""
+    if _is_lexbor(node):
+        return node.css_first(selector)
+    return node.select_one(selector)
+
+
+class _HostRateLimiter:
+    """按域名限速：保证同一域名两次请求的间隔不小于min_interval秒"""
+
+    def __init__(self, min_interval: float):
+        self.min_interval = min_interval
+        self._next_at = {}  # 域名 -> 下次允许请求的时间戳
+        self._lock = threading.Lock()
+
+    def _reserve(self, host: str) -> float:
+        """预订该域名的下一个请求时隙，返回需要等待的秒数"""
+        if self.min_interval <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            at = max(self._next_at.get(host, now), now)
+            self._next_at[host] = at + self.min_interval
+            return at - now
+
+    def wait(self, host: str):
+        delay = self._reserve(host)
+        if delay > 0:
+            time.sleep(delay)
+
+    async def wait_async(self, host: str):
+        delay = self._reserve(host)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
 
 class WebContentExtractor:
     """通用网页内容提取器"""
-    
+
     def __init__(self, config: ExtractionConfig):
         """
         初始化提取器
-        
+
         Args:
             config: 提取配置对象
         """
@@ -28,367 +145,671 @@ class WebContentExtractor:
         self.failed_urls = []
         self.success_count = 0
         self.fail_count = 0
-    
+        # 复用连接池：同域名请求走keep-alive，省去每次TCP/TLS握手
+        self.session = requests.Session()
+        self.session.headers.update(config.headers)
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        # 预计算热路径常量：小写的跳过关键词、绝对URL前缀
+        self._skip_keywords = tuple(k.lower() for k in config.image_skip_keywords)
+        self._abs_prefix = ('http://', 'https://')
+        # 跳过选择器合并为一个分组选择器：剪除时只需遍历一次DOM
+        self._skip_selector = ', '.join(config.skip_selectors) if config.skip_selectors else None
+        # 按域名限速代替固定的全局sleep：不同域名互不阻塞
+        self._rate_limiter = _HostRateLimiter(config.delay)
+        # 本次运行已下载的图片：URL -> 本地绝对路径，跨文章复用避免重复抓取
+        self._seen_images = {}
+        # 解析器选择：selectolax > lxml > html.parser，按安装情况逐级回退
+        self._parser = config.html_parser
+        if self._parser == 'selectolax' and LexborHTMLParser is None:
+            self._parser = 'lxml'
+        if self._parser == 'lxml':
+            try:
+                import lxml  # noqa: F401
+            except ImportError:
+                self._parser = 'html.parser'
+
     def extract_articles(self, article_list: List[Dict[str, str]]) -> Dict:
         """
         批量提取文章
-        
+
         Args:
             article_list: 文章列表，格式: [{"title": "标题", "url": "URL"}, ...]
-        
+
         Returns:
             提取结果统计
         """
         # 创建输出目录
         os.makedirs(self.config.output_dir, exist_ok=True)
-        
+
         self._log(f"开始提取 {len(article_list)} 篇文章...")
         self._log("="*60)
-        
+
+        # 安装aiohttp且并发数大于1时并发抓取，否则回退串行
+        if aiohttp is not None and self.config.concurrency > 1 and len(article_list) > 1:
+            asyncio.run(self._extract_articles_async(article_list))
+        else:
+            self._extract_articles_serial(article_list)
+
+        # 保存结果
+        results = self._save_results()
+        self.close()
+
+        self._log("\n" + "="*60)
+        self._log(f"提取完成!")
+        self._log(f"成功: {self.success_count} 篇")
+        self._log(f"失败: {self.fail_count} 篇")
+        self._log("="*60)
+
+        return results
+
+    def close(self):
+        """关闭HTTP连接池"""
+        self.session.close()
+
+    def _extract_articles_serial(self, article_list: List[Dict[str, str]]):
+        """串行提取文章（无aiohttp或并发数为1时的回退路径）"""
         for i, article in enumerate(article_list, 1):
             title = article.get('title', f'Article_{i}')
             url = article.get('url', '')
-            
+
             if not url:
                 self._log(f"[{i}/{len(article_list)}] 跳过: {title} (无URL)")
                 self.fail_count += 1
                 continue
-            
+
             self._log(f"\n[{i}/{len(article_list)}] 处理: {title}")
-            
+
             # 提取文章内容
             success = self._extract_single_article(url, title)
-            
+
             if success:
                 self.success_count += 1
             else:
                 self.fail_count += 1
                 self.failed_urls.append({"title": title, "url": url})
-            
-            # 延迟，避免请求过快
-            if i < len(article_list):
-                time.sleep(self.config.delay)
-        
-        # 保存结果
-        results = self._save_results()
-        
-        self._log("\n" + "="*60)
-        self._log(f"提取完成!")
-        self._log(f"成功: {self.success_count} 篇")
-        self._log(f"失败: {self.fail_count} 篇")
-        self._log("="*60)
-        
-        return results
-    
+
+    async def _extract_articles_async(self, article_list: List[Dict[str, str]]):
+        """并发提取文章：aiohttp抓取 + 信号量限制并发数"""
+        sem = asyncio.Semaphore(self.config.concurrency)
+        connector = aiohttp.TCPConnector(limit_per_host=self.config.concurrency)
+        timeout = aiohttp.ClientTimeout(total=self.config.timeout)
+
+        # 可选进程池：解析+Markdown生成是CPU密集操作，单进程会被GIL串行化
+        pool = ProcessPoolExecutor(max_workers=self.config.parse_workers) \
+            if self.config.parse_workers > 0 else None
+
+        try:
+            async with aiohttp.ClientSession(
+                connector=connector,
+                timeout=timeout,
+                headers=self.config.headers,
+            ) as session:
+                tasks = [
+                    self._extract_one_async(session, sem, pool, i, len(article_list), article)
+                    for i, article in enumerate(article_list, 1)
+                ]
+                await asyncio.gather(*tasks)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+    async def _extract_one_async(self, session, sem, pool, index: int, total: int, article: Dict[str, str]):
+        """抓取并处理单篇文章（并发路径）"""
+        title = article.get('title', f'Article_{index}')
+        url = article.get('url', '')
+
+        if not url:
+            self._log(f"[{index}/{total}] 跳过: {title} (无URL)")
+            self.fail_count += 1
+            return
+
+        self._log(f"[{index}/{total}] 处理: {title}")
+
+        try:
+            async with sem:
+                html = await self._fetch_with_retry_async(session, url)
+            loop = asyncio.get_running_loop()
+            if pool is not None:
+                # CPU部分进进程池并行解析；文件写入和图片下载留在本进程
+                markdown, image_urls = await loop.run_in_executor(
+                    pool, _render_article, self.config, html, title, url)
+                if markdown is None:
+                    self._log(f"  ✗ 未找到主内容区域 (选择器: {self.config.main_content_selector})")
+                    success = False
+                else:
+                    success = await loop.run_in_executor(
+                        None, self._save_article, markdown, image_urls, title)
+            else:
+                # 解析/生成/图片下载放到线程池，避免阻塞事件循环
+                success = await loop.run_in_executor(None, self._process_article, html, url, title)
+        except Exception as e:
+            self._log(f"  ✗ 错误: {e}")
+            success = False
+
+        if success:
+            self.success_count += 1
+        else:
+            self.fail_count += 1
+            self.failed_urls.append({"title": title, "url": url})
+
+    def _retry_delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """计算重试等待时间：指数退避+随机抖动，优先采用Retry-After响应头"""
+        if retry_after:
+            try:
+                return float(retry_after)
+            except ValueError:
+                pass
+        base = self.config.delay if self.config.delay > 0 else 1.0
+        return min(30.0, base * (2 ** attempt)) + random.uniform(0, 0.5)
+
+    def _fetch_with_retry(self, url: str):
+        """抓取URL（串行路径）：按域名限速，429/5xx/网络错误时指数退避重试"""
+        host = urlparse(url).netloc
+        for attempt in range(self.config.max_retries + 1):
+            self._rate_limiter.wait(host)
+            try:
+                response = self.session.get(url, timeout=self.config.timeout)
+            except requests.RequestException as e:
+                if attempt >= self.config.max_retries:
+                    raise
+                delay = self._retry_delay(attempt)
+                self._log(f"  ! 请求失败({e})，{delay:.1f}秒后重试")
+                time.sleep(delay)
+                continue
+
+            if (response.status_code == 429 or response.status_code >= 500) \
+                    and attempt < self.config.max_retries:
+                delay = self._retry_delay(attempt, response.headers.get('Retry-After'))
+                self._log(f"  ! HTTP {response.status_code}，{delay:.1f}秒后重试")
+                time.sleep(delay)
+                continue
+
+            return response
+
+    async def _fetch_with_retry_async(self, session, url: str) -> bytes:
+        """抓取URL（并发路径）：按域名限速，429/5xx/网络错误时指数退避重试"""
+        host = urlparse(url).netloc
+        for attempt in range(self.config.max_retries + 1):
+            await self._rate_limiter.wait_async(host)
+            try:
+                async with session.get(url) as response:
+                    if (response.status == 429 or response.status >= 500) \
+                            and attempt < self.config.max_retries:
+                        delay = self._retry_delay(attempt, response.headers.get('Retry-After'))
+                        self._log(f"  ! HTTP {response.status}，{delay:.1f}秒后重试")
+                        await asyncio.sleep(delay)
+                        continue
+                    response.raise_for_status()
+                    return await response.read()
+            except aiohttp.ClientResponseError:
+                # 4xx等明确的客户端错误（或重试次数用尽的429/5xx）不再重试
+                raise
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if attempt >= self.config.max_retries:
+                    raise
+                delay = self._retry_delay(attempt)
+                self._log(f"  ! 请求失败({e})，{delay:.1f}秒后重试")
+                await asyncio.sleep(delay)
+
+    def _parse_html(self, html: bytes):
+        """解析HTML原始字节，返回可查询的根节点（编码由解析器从meta声明探测）"""
+        if self._parser == 'selectolax':
+            return LexborHTMLParser(html).root
+        return BeautifulSoup(html, self._parser)
+
     def _extract_single_article(self, url: str, title: str) -> bool:
         """
         提取单篇文章
-        
+
         Args:
             url: 文章URL
             title: 文章标题
-        
+
         Returns:
             是否成功
         """
         try:
             # 获取网页内容
-            response = requests.get(
-                url, 
-                timeout=self.config.timeout,
-                headers=self.config.headers
-            )
-            response.encoding = self.config.file_encoding
-            
-            # 解析HTML
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # 提取主内容
-            main_content = soup.select_one(self.config.main_content_selector)
-            if not main_content:
-                main_content = soup.find(self.config.main_content_selector)
-            
-            if not main_content:
+            response = self._fetch_with_retry(url)
+        except Exception as e:
+            self._log(f"  ✗ 错误: {e}")
+            if self.config.verbose:
+                traceback.print_exc()
+            return False
+
+        # 直接传递原始字节，省去Python层的整页解码；编码探测交给解析器
+        return self._process_article(response.content, url, title)
+
+    def _process_article(self, html: bytes, url: str, title: str) -> bool:
+        """
+        解析HTML并生成Markdown、下载图片
+
+        Args:
+            html: 网页HTML原始字节
+            url: 文章URL
+            title: 文章标题
+
+        Returns:
+            是否成功
+        """
+        try:
+            markdown, image_urls = self._render_markdown(html, title, url)
+
+            if markdown is None:
                 self._log(f"  ✗ 未找到主内容区域 (选择器: {self.config.main_content_selector})")
                 return False
-            
-            # 生成Markdown内容
-            markdown = self._generate_markdown(main_content, title, url)
-            
+
+            return self._save_article(markdown, image_urls, title)
+
+        except Exception as e:
+            self._log(f"  ✗ 错误: {e}")
+            if self.config.verbose:
+                traceback.print_exc()
+            return False
+
+    def _render_markdown(self, html: bytes, title: str, url: str) -> Tuple[Optional[str], List[str]]:
+        """
+        解析HTML并生成Markdown（纯CPU步骤，无磁盘/网络I/O，可在子进程中执行）
+
+        Args:
+            html: 网页HTML原始字节
+            title: 文章标题
+            url: 文章URL
+
+        Returns:
+            (Markdown文本, 有效图片URL列表)；未找到主内容时Markdown为None
+        """
+        # 解析HTML
+        soup = self._parse_html(html)
+
+        # 提取主内容
+        main_content = _css_first(soup, self.config.main_content_selector)
+        if main_content is None and not _is_lexbor(soup):
+            main_content = soup.find(self.config.main_content_selector)
+
+        if main_content is None:
+            return None, []
+
+        # 预先剪除跳过区域：每个选择器一次查询+decompose，
+        # 代替生成时逐元素逐选择器的父链/子树查询
+        self._prune_skipped(main_content)
+
+        # 收集待下载的图片URL（如果配置启用）；
+        # 本地文件名由序号确定，生成Markdown时即可直接引用本地路径
+        image_urls = self._collect_image_urls(main_content) if self.config.download_images else []
+        image_map = self._build_image_map(image_urls)
+
+        # 生成Markdown内容
+        markdown = self._generate_markdown(main_content, title, url, image_map)
+
+        return markdown, image_urls
+
+    def _save_article(self, markdown: str, image_urls: List[str], title: str) -> bool:
+        """
+        写出Markdown文件并下载图片（I/O步骤，始终在主进程执行）
+
+        Args:
+            markdown: Markdown文本
+            image_urls: 待下载的图片URL列表
+            title: 文章标题
+
+        Returns:
+            是否成功
+        """
+        try:
             # 创建文章文件夹
             article_folder = os.path.join(self.config.output_dir, self._sanitize_filename(title))
             os.makedirs(article_folder, exist_ok=True)
-            
-            # 保存Markdown文件
+
+            # 先下载图片再写Markdown：引用已是本地路径，无需事后改写文件
+            if image_urls:
+                downloaded = self._download_images(image_urls, article_folder, title)
+                markdown = self._restore_failed_images(markdown, image_urls, downloaded)
+
+            # 保存Markdown文件（全程只写这一次）
             md_file = os.path.join(article_folder, f"{self._sanitize_filename(title)}.md")
             with open(md_file, 'w', encoding=self.config.file_encoding) as f:
                 f.write(markdown)
-            
+
             self._log(f"  ✓ 已保存: {md_file}")
-            
-            # 下载图片（如果配置启用）
-            if self.config.download_images:
-                self._download_images(main_content, article_folder, title)
-            
+
             return True
-            
+
         except Exception as e:
             self._log(f"  ✗ 错误: {e}")
             if self.config.verbose:
-                import traceback
                 traceback.print_exc()
             return False
-    
-    def _generate_markdown(self, content_element, title: str, url: str) -> str:
+
+    def _prune_skipped(self, main_content):
+        """从内容树中移除所有匹配跳过选择器的子树"""
+        if self._skip_selector is None:
+            return
+        for node in _css(main_content, self._skip_selector):
+            node.decompose()
+
+    def _image_filename(self, img_url: str, index: int) -> str:
+        """图片的本地文件名（由序号和URL后缀确定）"""
+        ext = os.path.splitext(urlparse(img_url).path)[1] or '.png'
+        return f"image_{index}{ext}"
+
+    def _build_image_map(self, image_urls: List[str]) -> Dict[str, str]:
+        """图片URL -> Markdown中引用的本地相对路径"""
+        folder = self.config.images_folder_name
+        return {
+            img_url: f"./{folder}/{self._image_filename(img_url, i)}"
+            for i, img_url in enumerate(image_urls, 1)
+        }
+
+    def _restore_failed_images(self, markdown: str, image_urls: List[str],
+                               downloaded: Dict[str, str]) -> str:
+        """下载失败的图片引用还原为原始URL，避免Markdown中出现悬空的本地路径"""
+        folder = self.config.images_folder_name
+        replacements = {}
+        for i, img_url in enumerate(image_urls, 1):
+            if img_url not in downloaded:
+                local = f"](./{folder}/{self._image_filename(img_url, i)})"
+                replacements[local] = f"]({img_url})"
+
+        if not replacements:
+            return markdown
+
+        pattern = re.compile('|'.join(map(re.escape, replacements)))
+        return pattern.sub(lambda m: replacements[m.group(0)], markdown)
+
+    def _generate_markdown(self, content_element, title: str, url: str,
+                           image_map: Optional[Dict[str, str]] = None) -> str:
         """
         生成Markdown内容
-        
+
         Args:
             content_element: 内容元素
             title: 标题
             url: 原文URL
-        
+            image_map: 图片URL到本地路径的映射（可选）
+
         Returns:
             Markdown文本
         """
-        markdown = f"# {title}\n\n"
-        markdown += f"> 原文链接: [{url}]({url})\n\n"
-        
-        # 遍历所有内容元素
-        processed_elements = set()  # 记录已处理的元素，避免重复
-        for element in content_element.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'p', 'ul', 'ol', 'pre', 'img', 'blockquote', 'table']):
-            # 跳过已处理的元素
-            if id(element) in processed_elements:
-                continue
-            
-            # 跳过指定的元素
-            if self._should_skip_element(element):
+        # 列表收集+join拼接，避免大文章反复创建中间字符串
+        parts = [f"# {title}\n\n", f"> 原文链接: [{url}]({url})\n\n"]
+
+        # 单次深度优先遍历：容器元素整体输出后不再下探，
+        # 其余元素继续下探查找嵌套的块级内容，无需记录已处理集合
+        stack = list(_node_children(content_element))
+        stack.reverse()
+        while stack:
+            element = stack.pop()
+            tag_name = _node_tag(element)
+
+            # 文本节点不参与块级遍历
+            if tag_name is None:
                 continue
-            
-            tag_name = element.name
-            
-            # 标记当前元素为已处理
-            processed_elements.add(id(element))
-            
-            # 如果是容器元素（blockquote, ul, ol, pre, table），标记其所有子元素为已处理
-            if tag_name in ['blockquote', 'ul', 'ol', 'pre', 'table']:
-                for child in element.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'p', 'ul', 'ol', 'pre', 'img', 'blockquote', 'table']):
-                    processed_elements.add(id(child))
-            
+
             # 处理标题
             if tag_name in ['h1', 'h2', 'h3', 'h4', 'h5', 'h6']:
                 level = int(tag_name[1])
                 text = self._process_text_with_format(element)
-                markdown += f"\n{'#' * level} {text}\n\n"
-            
+                parts.append(f"\n{'#' * level} {text}\n\n")
+
             # 处理段落
             elif tag_name == 'p':
                 text = self._process_text_with_format(element).strip()
                 if text:
-                    markdown += f"{text}\n\n"
-            
+                    parts.append(f"{text}\n\n")
+
             # 处理列表
             elif tag_name in ['ul', 'ol']:
-                for li in element.find_all('li', recursive=False):
+                for li in _node_children(element):
+                    if _node_tag(li) != 'li':
+                        continue
                     li_text = self._process_text_with_format(li).strip()
-                    markdown += f"- {li_text}\n"
-                markdown += '\n'
-            
+                    parts.append(f"- {li_text}\n")
+                parts.append('\n')
+
             # 处理代码块
             elif tag_name == 'pre':
-                code = element.find('code')
-                if code:
+                code = _css_first(element, 'code')
+                if code is not None:
                     lang = self._extract_code_language(code)
-                    markdown += f"```{lang}\n{code.get_text()}\n```\n\n"
-            
+                    parts.append(f"```{lang}\n{_node_text(code)}\n```\n\n")
+
             # 处理图片
             elif tag_name == 'img':
-                img_md = self._process_image(element)
+                img_md = self._process_image(element, image_map)
                 if img_md:
-                    markdown += f"{img_md}\n\n"
-            
+                    parts.append(f"{img_md}\n\n")
+
             # 处理引用
             elif tag_name == 'blockquote':
                 text = self._process_text_with_format(element).strip()
                 lines = text.split('\n')
                 for line in lines:
                     if line.strip():
-                        markdown += f"> {line.strip()}\n"
-                markdown += '\n'
-            
+                        parts.append(f"> {line.strip()}\n")
+                parts.append('\n')
+
             # 处理表格
             elif tag_name == 'table':
                 table_md = self._process_table(element)
                 if table_md:
-                    markdown += f"{table_md}\n\n"
-        
-        return markdown
-    
+                    parts.append(f"{table_md}\n\n")
+
+            # 非容器元素继续下探（如div包裹的段落、p内嵌的图片）
+            if tag_name not in _CONTAINER_TAGS:
+                children = list(_node_children(element))
+                if children:
+                    stack.extend(reversed(children))
+
+        return ''.join(parts)
+
     def _process_text_with_format(self, element) -> str:
         """
         处理文本，保留格式
-        
+
         Args:
             element: HTML元素
-        
+
         Returns:
             格式化的文本
         """
-        result = ""
-        
-        for child in element.children:
-            if isinstance(child, NavigableString):
-                result += str(child)
-            elif child.name in ['strong', 'b'] and self.config.preserve_bold:
-                result += f"**{child.get_text()}**"
-            elif child.name in ['em', 'i'] and self.config.preserve_italic:
-                result += f"*{child.get_text()}*"
-            elif child.name == 'code' and self.config.preserve_code:
-                result += f"`{child.get_text()}`"
-            elif child.name == 'a' and self.config.preserve_links:
-                href = child.get('href', '')
-                text = child.get_text()
-                # 转换为绝对URL
-                if href and not href.startswith(('http://', 'https://', '#')):
-                    href = urljoin(self.config.base_url, href)
-                result += f"[{text}]({href})"
-            else:
-                # 递归处理嵌套元素
-                result += self._process_text_with_format(child)
-        
-        return result
-    
-    def _process_image(self, img_element) -> Optional[str]:
+        # 配置项提升为局部变量：本函数在最热的循环里被递归调用，
+        # 每次self.config.xxx都是两级属性查找，局部名仅一次
+        config = self.config
+        preserve_bold = config.preserve_bold
+        preserve_italic = config.preserve_italic
+        preserve_code = config.preserve_code
+        preserve_links = config.preserve_links
+        base_url = config.base_url
+
+        def render(element) -> str:
+            parts = []
+
+            for child in _node_children(element):
+                tag = _node_tag(child)
+                if tag is None:
+                    parts.append(_text_node_value(child))
+                elif tag in ['strong', 'b'] and preserve_bold:
+                    parts.append(f"**{_node_text(child)}**")
+                elif tag in ['em', 'i'] and preserve_italic:
+                    parts.append(f"*{_node_text(child)}*")
+                elif tag == 'code' and preserve_code:
+                    parts.append(f"`{_node_text(child)}`")
+                elif tag == 'a' and preserve_links:
+                    href = _node_attr(child, 'href')
+                    text = _node_text(child)
+                    # 转换为绝对URL
+                    if href and not href.startswith(('http://', 'https://', '#')):
+                        href = urljoin(base_url, href)
+                    parts.append(f"[{text}]({href})")
+                else:
+                    # 递归处理嵌套元素
+                    parts.append(render(child))
+
+            return ''.join(parts)
+
+        return render(element)
+
+    def _process_image(self, img_element, image_map: Optional[Dict[str, str]] = None) -> Optional[str]:
         """
         处理图片元素
-        
+
         Args:
             img_element: 图片元素
-        
+            image_map: 图片URL到本地路径的映射（可选）
+
         Returns:
             Markdown格式的图片
         """
-        src = img_element.get('src', '')
-        alt = img_element.get('alt', 'image')
-        
+        src = _node_attr(img_element, 'src')
+        alt = _node_attr(img_element, 'alt', 'image')
+
         # 跳过特定关键词的图片
-        if any(keyword in src.lower() for keyword in self.config.image_skip_keywords):
+        src_lower = src.lower()
+        if any(keyword in src_lower for keyword in self._skip_keywords):
             return None
-        
+
         if not src:
             return None
-        
+
         # 转换为绝对URL
-        if not src.startswith(('http://', 'https://')):
+        if not src.startswith(self._abs_prefix):
             src = urljoin(self.config.base_url, src)
-        
+
+        # 待下载的图片直接引用本地路径
+        if image_map:
+            src = image_map.get(src, src)
+
         return f"![{alt}]({src})"
-    
+
     def _process_table(self, table_element) -> str:
         """处理表格"""
-        markdown = ""
-        
+        parts = []
+
         # 处理表头
-        thead = table_element.find('thead')
-        if thead:
-            headers = [th.get_text().strip() for th in thead.find_all(['th', 'td'])]
-            markdown += "| " + " | ".join(headers) + " |\n"
-            markdown += "|" + "|".join(["---" for _ in headers]) + "|\n"
-        
+        thead = _css_first(table_element, 'thead')
+        if thead is not None:
+            headers = [_node_text(th).strip() for th in _css(thead, 'th, td')]
+            parts.append("| " + " | ".join(headers) + " |\n")
+            parts.append("|" + "|".join(["---" for _ in headers]) + "|\n")
+
         # 处理表体
-        tbody = table_element.find('tbody') or table_element
-        for tr in tbody.find_all('tr'):
-            cells = [td.get_text().strip() for td in tr.find_all(['td', 'th'])]
+        tbody = _css_first(table_element, 'tbody')
+        if tbody is None:
+            tbody = table_element
+        for tr in _css(tbody, 'tr'):
+            cells = [_node_text(td).strip() for td in _css(tr, 'td, th')]
             if cells:
-                markdown += "| " + " | ".join(cells) + " |\n"
-        
-        return markdown
-    
+                parts.append("| " + " | ".join(cells) + " |\n")
+
+        return ''.join(parts)
+
     def _extract_code_language(self, code_element) -> str:
         """提取代码语言"""
         lang = ''
-        if code_element.get('class'):
-            for cls in code_element.get('class'):
-                if cls.startswith('language-'):
-                    lang = cls.replace('language-', '')
-                    break
+        for cls in _node_attr(code_element, 'class').split():
+            if cls.startswith('language-'):
+                lang = cls.replace('language-', '')
+                break
         return lang
-    
-    def _should_skip_element(self, element) -> bool:
-        """判断是否应该跳过元素"""
-        for selector in self.config.skip_selectors:
-            if element.find_parent(selector) or element.select_one(selector):
-                return True
-        return False
-    
-    def _download_images(self, content_element, article_folder: str, title: str):
+
+    def _collect_image_urls(self, content_element) -> List[str]:
+        """收集内容中所有有效图片的绝对URL"""
+        valid_images = []
+
+        for img in _css(content_element, 'img'):
+            src = _node_attr(img, 'src')
+            if src and not any(kw in src.lower() for kw in self._skip_keywords):
+                if not src.startswith(self._abs_prefix):
+                    src = urljoin(self.config.base_url, src)
+                valid_images.append(src)
+
+        return valid_images
+
+    def _download_images(self, valid_images: List[str], article_folder: str, title: str) -> Dict[str, str]:
         """
         下载文章中的所有图片
-        
+
         Args:
-            content_element: 内容元素
+            valid_images: 图片URL列表
             article_folder: 文章文件夹路径
             title: 文章标题
+
+        Returns:
+            下载成功的 图片URL -> 本地文件名 映射
         """
-        images = content_element.find_all('img')
-        valid_images = []
-        
-        for img in images:
-            src = img.get('src', '')
-            if src and not any(kw in src.lower() for kw in self.config.image_skip_keywords):
-                if not src.startswith(('http://', 'https://')):
-                    src = urljoin(self.config.base_url, src)
-                valid_images.append(src)
-        
-        if not valid_images:
-            return
-        
         # 创建图片文件夹
         images_folder = os.path.join(article_folder, self.config.images_folder_name)
         os.makedirs(images_folder, exist_ok=True)
-        
+
         self._log(f"  下载图片: {len(valid_images)} 张")
-        
-        for i, img_url in enumerate(valid_images, 1):
-            try:
-                response = requests.get(img_url, timeout=self.config.timeout)
+
+        # 线程池并发下载：图片下载是纯I/O，串行+固定延迟会浪费大量等待时间
+        url_map = {}  # 图片URL -> 本地文件名
+        workers = min(self.config.image_workers, len(valid_images))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(self._fetch_one_image, img_url, i, images_folder)
+                for i, img_url in enumerate(valid_images, 1)
+            ]
+            for future in as_completed(futures):
+                result = future.result()
+                if result is not None:
+                    img_url, filename = result
+                    url_map[img_url] = filename
+
+        return url_map
+
+    def _fetch_one_image(self, img_url: str, index: int, images_folder: str) -> Optional[Tuple[str, str]]:
+        """
+        下载单张图片
+
+        Args:
+            img_url: 图片URL
+            index: 图片序号（用于文件名）
+            images_folder: 图片保存目录
+
+        Returns:
+            成功返回 (图片URL, 本地文件名)，失败返回None
+        """
+        try:
+            filename = self._image_filename(img_url, index)
+            filepath = os.path.join(images_folder, filename)
+
+            # 重复运行时文件已存在：直接跳过
+            if os.path.exists(filepath):
+                self._seen_images.setdefault(img_url, filepath)
+                return img_url, filename
+
+            # 同一URL本次运行已下载过（如多篇文章共用配图）：本地复制，不再请求
+            cached = self._seen_images.get(img_url)
+            if cached and os.path.exists(cached):
+                shutil.copyfile(cached, filepath)
+                return img_url, filename
+
+            # 流式写盘：按64KB分块边收边写，大图不再整张缓存在内存里
+            with self.session.get(img_url, timeout=self.config.timeout, stream=True) as response:
                 response.raise_for_status()
-                
-                # 生成文件名
-                ext = os.path.splitext(urlparse(img_url).path)[1] or '.png'
-                filename = f"image_{i}{ext}"
-                filepath = os.path.join(images_folder, filename)
-                
+                # 明显的非图片响应（重定向页、错误页）不落盘，也省去读取响应体
+                content_type = response.headers.get('Content-Type', '')
+                if content_type.startswith('text/'):
+                    if self.config.verbose:
+                        self._log(f"    跳过非图片内容({content_type}): {img_url}")
+                    return None
                 with open(filepath, 'wb') as f:
-                    f.write(response.content)
-                
-                # 更新Markdown中的图片引用
-                self._update_image_reference(article_folder, title, img_url, filename)
-                
-            except Exception as e:
-                if self.config.verbose:
-                    self._log(f"    图片下载失败: {img_url} - {e}")
-            
-            time.sleep(0.3)  # 短暂延迟
-    
-    def _update_image_reference(self, article_folder: str, title: str, old_url: str, new_filename: str):
-        """更新Markdown中的图片引用"""
-        md_file = os.path.join(article_folder, f"{self._sanitize_filename(title)}.md")
-        
-        try:
-            with open(md_file, 'r', encoding=self.config.file_encoding) as f:
-                content = f.read()
-            
-            # 替换图片URL为本地路径
-            new_path = f"./{self.config.images_folder_name}/{new_filename}"
-            content = content.replace(f"]({old_url})", f"]({new_path})")
-            
-            with open(md_file, 'w', encoding=self.config.file_encoding) as f:
-                f.write(content)
+                    for chunk in response.iter_content(chunk_size=65536):
+                        f.write(chunk)
+
+            self._seen_images[img_url] = filepath
+            return img_url, filename
+
         except Exception as e:
             if self.config.verbose:
-                self._log(f"    更新图片引用失败: {e}")
-    
+                self._log(f"    图片下载失败: {img_url} - {e}")
+            return None
+
     def _save_results(self) -> Dict:
         """保存提取结果"""
         results = {
@@ -396,51 +817,52 @@ class WebContentExtractor:
             "fail_count": self.fail_count,
             "failed_urls": self.failed_urls
         }
-        
+
         # 保存失败的URL列表
         if self.config.save_failed_urls and self.failed_urls:
             failed_file = os.path.join(self.config.output_dir, "failed_urls.json")
             with open(failed_file, 'w', encoding=self.config.file_encoding) as f:
                 json.dump(self.failed_urls, f, ensure_ascii=False, indent=2)
             self._log(f"\n失败URL已保存: {failed_file}")
-        
+
         # 创建索引文件
         if self.config.create_index:
             self._create_index()
-        
+
         return results
-    
+
     def _create_index(self):
         """创建文章索引"""
         index_file = os.path.join(self.config.output_dir, "README.md")
-        
-        folders = [f for f in os.listdir(self.config.output_dir) 
-                  if os.path.isdir(os.path.join(self.config.output_dir, f))]
-        
-        content = f"# 提取的文章索引\n\n"
-        content += f"总计: {len(folders)} 篇文章\n\n"
-        content += f"## 文章列表\n\n"
-        
-        for i, folder in enumerate(sorted(folders), 1):
-            md_files = [f for f in os.listdir(os.path.join(self.config.output_dir, folder))
-                       if f.endswith('.md')]
+
+        # scandir一次拿到目录项及其类型，省去每个条目一次stat调用
+        with os.scandir(self.config.output_dir) as it:
+            folders = sorted(entry.name for entry in it if entry.is_dir())
+
+        parts = [f"# 提取的文章索引\n\n"]
+        parts.append(f"总计: {len(folders)} 篇文章\n\n")
+        parts.append(f"## 文章列表\n\n")
+
+        for i, folder in enumerate(folders, 1):
+            with os.scandir(os.path.join(self.config.output_dir, folder)) as it:
+                md_files = [entry.name for entry in it if entry.name.endswith('.md')]
             if md_files:
-                content += f"{i}. [{folder}](./{folder}/{md_files[0]})\n"
-        
-        with open(index_file, 'w', encoding=self.config.file_encoding) as f:
-            f.write(content)
-    
+                parts.append(f"{i}. [{folder}](./{folder}/{md_files[0]})\n")
+
+        # 拼好整个索引后一次写出，使用大缓冲避免多次小块写盘
+        with open(index_file, 'w', encoding=self.config.file_encoding, buffering=1 << 20) as f:
+            f.write(''.join(parts))
+
     def _sanitize_filename(self, filename: str) -> str:
-        """清理文件名，移除非法字符"""
-        import re
-        # 移除Windows不允许的字符
-        filename = re.sub(r'[<>:"/\\|?*]', '_', filename)
-        # 限制长度
-        if len(filename) > 200:
-            filename = filename[:200]
-        return filename.strip()
-    
+        """清理文件名，移除非法字符并限制长度"""
+        return _FILENAME_RE.sub('_', filename)[:200].strip()
+
     def _log(self, message: str):
         """输出日志"""
         if self.config.verbose:
             print(message)
+
+
+def _render_article(config: ExtractionConfig, html: bytes, title: str, url: str):
+    """进程池工作函数：在子进程中完成解析+Markdown生成"""
+    return WebContentExtractor(config)._render_markdown(html, title, url)